@@ -0,0 +1,41 @@
+-- Server-side aggregation for the Reporter's daily briefing.
+-- Groups the last N hours of ledger entries into briefing categories in
+-- one seq scan, so the client downloads a handful of counts instead of
+-- every row. Apply once with the Supabase SQL editor or psql.
+
+create or replace function get_daily_briefing(hours int default 24)
+returns table(category text, entry_count bigint)
+language sql
+stable
+as $$
+    select category, count(*)::bigint as entry_count
+    from (
+        select case
+            when message_type = 'security_alert' then 'security_alerts'
+            when message_type in ('scan_complete', 'market_scan', 'github_scan') then 'market_intelligence'
+            when message_type in ('diagnostics_complete', 'simulation_complete') then 'system_health'
+            when message_type in ('plan_validation', 'plan_approved') then 'planning'
+            when agent_type = 'research' then 'research'
+        end as category
+        from ledger
+        where created_at >= now() - make_interval(hours => hours)
+    ) categorized
+    where category is not null
+    group by category
+
+    union all
+
+    select 'planning_approved', count(*)::bigint
+    from ledger
+    where created_at >= now() - make_interval(hours => hours)
+      and message_type in ('plan_validation', 'plan_approved')
+      and payload->>'verdict' = 'APPROVED'
+
+    union all
+
+    select 'planning_rejected', count(*)::bigint
+    from ledger
+    where created_at >= now() - make_interval(hours => hours)
+      and message_type in ('plan_validation', 'plan_approved')
+      and payload->>'verdict' = 'REJECTED'
+$$;
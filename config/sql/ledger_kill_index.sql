@@ -0,0 +1,6 @@
+-- Composite index so the workers' kill-signal check is an index lookup
+-- instead of a sequential scan over the ledger.
+-- Run once in the Supabase SQL editor.
+
+create index if not exists idx_ledger_kill_signal
+    on ledger (agent_id, message_type, created_at desc);
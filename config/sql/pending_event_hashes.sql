@@ -0,0 +1,8 @@
+-- Deduped view for the consensus sweep: the server hands back one row
+-- per pending event instead of every vote row. Apply once with the
+-- Supabase SQL editor or psql.
+
+create or replace view pending_event_hashes as
+select distinct event_hash
+from consensus_votes
+where vote_status = 'pending';
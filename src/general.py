@@ -11,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from vip.supervisor import VIPSupervisor
 from vip.survivor import SurvivorOrgan
+from vip._db import get_client
 from workers.spider import SpiderWorker
 
 class General:
@@ -62,10 +63,10 @@ class General:
     def read_ledger(self):
         """Check the ledger for new messages"""
         try:
-            from supabase import create_client
-            supabase = create_client(self.vip.supabase_url, self.vip.supabase_key)
-            
-            response = supabase.table("ledger").select("*").order("created_at", desc=True).limit(5).execute()
+            supabase = get_client(self.vip.supabase_url, self.vip.supabase_key)
+
+            # Only the two fields the cycle report prints
+            response = supabase.table("ledger").select("agent_id, message_type").order("created_at", desc=True).limit(5).execute()
             return response.data
         except Exception as e:
             self.survivor.error(self.name, f"Cannot read ledger: {e}")
@@ -3,37 +3,39 @@ Reporter Agent - The Voice of Nexus Sovereign
 Creates daily briefings from raw technical data in the ledger
 Transforms code into professional intelligence reports
 """
-import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
 
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
+from vip.survivor import BufferedLogger
 
 class ReporterAgent:
     def __init__(self):
         self.agent_id = "reporter_001"
         self.agent_type = "intelligence"
         self.name = "Reporter"
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
-        
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_KEY
+        self.logger = BufferedLogger(f"[{self.name}] ")
+
     def log(self, message):
-        print(f"[{self.name}] {message}")
+        self.logger.log(message)
         
     def fetch_recent_activity(self, hours=24):
         """Get recent activity from the ledger"""
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
             # Get activity from last 24 hours
             cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
             
+            # Only the columns the briefing actually reads
             response = supabase.table("ledger")\
-                .select("*")\
+                .select("message_type, agent_type, payload, created_at")\
                 .gte("created_at", cutoff_time)\
                 .order("created_at", desc=True)\
                 .execute()
@@ -43,78 +45,125 @@ class ReporterAgent:
         except Exception as e:
             self.log(f"ERROR fetching activity: {e}")
             return []
-            
-    def categorize_activity(self, entries):
-        """Categorize ledger entries by type"""
-        categories = {
-            "security_alerts": [],
-            "market_intelligence": [],
-            "system_health": [],
-            "planning": [],
-            "research": []
+
+    def fetch_briefing_counts(self, hours=24):
+        """Server-side categorize+count (config/sql/get_daily_briefing.sql)"""
+        try:
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
+            response = supabase.rpc("get_daily_briefing", {"hours": hours}).execute()
+            return {row["category"]: row["entry_count"] for row in response.data}
+
+        except Exception as e:
+            self.log(f"Server-side aggregation unavailable ({e}), aggregating client-side")
+            return None
+
+    def fetch_finding_entries(self, hours=24):
+        """Fetch only the rows that can carry key findings"""
+        try:
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
+            cutoff_time = (datetime.now() - timedelta(hours=hours)).isoformat()
+
+            response = supabase.table("ledger")\
+                .select("message_type, agent_type, payload, created_at")\
+                .gte("created_at", cutoff_time)\
+                .in_("message_type", ["security_alert", "scan_complete", "market_scan", "github_scan"])\
+                .execute()
+
+            return response.data
+
+        except Exception as e:
+            self.log(f"ERROR fetching findings: {e}")
+            return []
+
+    def analyze_activity(self, entries):
+        """Single pass over the ledger: counts, summary, findings, recommendations"""
+        breakdown = {
+            "security_alerts": 0,
+            "market_intelligence": 0,
+            "system_health": 0,
+            "planning": 0,
+            "research": 0
         }
-        
+        approved = 0
+        rejected = 0
+        findings = []
+
         for entry in entries:
             msg_type = entry.get("message_type", "")
             agent_type = entry.get("agent_type", "")
-            
+            payload = entry.get("payload", {}) or {}
+
             if msg_type == "security_alert":
-                categories["security_alerts"].append(entry)
-            elif msg_type in ["scan_complete", "market_scan", "github_scan"]:
-                categories["market_intelligence"].append(entry)
-            elif msg_type in ["diagnostics_complete", "simulation_complete"]:
-                categories["system_health"].append(entry)
-            elif msg_type in ["plan_validation", "plan_approved"]:
-                categories["planning"].append(entry)
+                breakdown["security_alerts"] += 1
+                keywords = payload.get("secret_keywords", [])
+                if keywords:
+                    org = payload.get("org", "Unknown")
+                    findings.append(f"Potential security exposure detected at {org}: {', '.join(keywords)}")
+            elif msg_type in ("scan_complete", "market_scan", "github_scan"):
+                breakdown["market_intelligence"] += 1
+                if payload.get("return_pct"):
+                    findings.append(f"Market simulation shows {payload['return_pct']}% average return")
+            elif msg_type in ("diagnostics_complete", "simulation_complete"):
+                breakdown["system_health"] += 1
+            elif msg_type in ("plan_validation", "plan_approved"):
+                breakdown["planning"] += 1
+                verdict = payload.get("verdict")
+                if verdict == "APPROVED":
+                    approved += 1
+                elif verdict == "REJECTED":
+                    rejected += 1
             elif agent_type == "research":
-                categories["research"].append(entry)
-                
-        return categories
-        
-    def generate_executive_summary(self, categories):
-        """Create executive summary for stakeholders"""
+                breakdown["research"] += 1
+
+        return self.summarize(breakdown, approved, rejected, findings)
+
+    def summarize(self, breakdown, approved, rejected, findings):
+        """Assemble summary and recommendations from pre-computed counters"""
+        # Executive summary straight from the counters - no second scan
         summary = []
-        
-        # Security section
-        if categories["security_alerts"]:
-            alerts = len(categories["security_alerts"])
-            summary.append(f"SECURITY: {alerts} high-priority alerts detected in last 24h.")
-            
-        # Market intelligence
-        if categories["market_intelligence"]:
-            intel_count = len(categories["market_intelligence"])
-            summary.append(f"INTELLIGENCE: {intel_count} new market signals processed.")
-            
-        # System health
-        if categories["system_health"]:
-            health_items = len(categories["system_health"])
-            summary.append(f"SYSTEMS: {health_items} diagnostic cycles completed successfully.")
-            
-        # Planning
-        if categories["planning"]:
-            plans = len(categories["planning"])
-            approved = sum(1 for p in categories["planning"] if p.get("payload", {}).get("verdict") == "APPROVED")
-            rejected = sum(1 for p in categories["planning"] if p.get("payload", {}).get("verdict") == "REJECTED")
-            summary.append(f"PLANNING: {plans} plans reviewed ({approved} approved, {rejected} rejected).")
-            
-        return summary
-        
-    def write_intelligence_briefing(self, summary, categories):
+        if breakdown["security_alerts"]:
+            summary.append(f"SECURITY: {breakdown['security_alerts']} high-priority alerts detected in last 24h.")
+        if breakdown["market_intelligence"]:
+            summary.append(f"INTELLIGENCE: {breakdown['market_intelligence']} new market signals processed.")
+        if breakdown["system_health"]:
+            summary.append(f"SYSTEMS: {breakdown['system_health']} diagnostic cycles completed successfully.")
+        if breakdown["planning"]:
+            summary.append(f"PLANNING: {breakdown['planning']} plans reviewed ({approved} approved, {rejected} rejected).")
+
+        # Strategic recommendations, also from the counters
+        recommendations = []
+        if breakdown["security_alerts"]:
+            recommendations.append("Investigate security alerts immediately - potential data exposure detected")
+        if breakdown["system_health"] < 3:
+            recommendations.append("Increase system monitoring frequency - reduced diagnostic coverage detected")
+        if rejected:
+            recommendations.append("Review rejected plans - address high-risk factors before resubmission")
+
+        return {
+            "summary": summary,
+            "breakdown": breakdown,
+            "total_entries": sum(breakdown.values()),
+            "findings": findings,
+            "recommendations": recommendations
+        }
+
+    def write_intelligence_briefing(self, analysis):
         """Write professional intelligence briefing to ledger"""
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
             briefing = {
                 "timestamp": datetime.now().isoformat(),
                 "period_covered": "24 hours",
-                "executive_summary": summary,
+                "executive_summary": analysis["summary"],
                 "detailed_categories": {
-                    "total_entries": sum(len(entries) for entries in categories.values()),
-                    "breakdown": {k: len(v) for k, v in categories.items()}
+                    "total_entries": analysis["total_entries"],
+                    "breakdown": analysis["breakdown"]
                 },
-                "key_findings": self.extract_key_findings(categories),
-                "recommendations": self.generate_recommendations(categories)
+                "key_findings": analysis["findings"],
+                "recommendations": analysis["recommendations"]
             }
             
             data = {
@@ -131,81 +180,53 @@ class ReporterAgent:
         except Exception as e:
             self.log(f"ERROR writing briefing: {e}")
             
-    def extract_key_findings(self, categories):
-        """Extract key findings from categorized data"""
-        findings = []
-        
-        # Security findings
-        for alert in categories["security_alerts"]:
-            payload = alert.get("payload", {})
-            org = payload.get("org", "Unknown")
-            keywords = payload.get("secret_keywords", [])
-            if keywords:
-                findings.append(f"Potential security exposure detected at {org}: {', '.join(keywords)}")
-                
-        # Market findings
-        for intel in categories["market_intelligence"]:
-            payload = intel.get("payload", {})
-            if payload.get("return_pct"):
-                findings.append(f"Market simulation shows {payload['return_pct']}% average return")
-                
-        return findings
-        
-    def generate_recommendations(self, categories):
-        """Generate strategic recommendations"""
-        recommendations = []
-        
-        # Security recommendations
-        if categories["security_alerts"]:
-            recommendations.append("Investigate security alerts immediately - potential data exposure detected")
-            
-        # System recommendations
-        if len(categories["system_health"]) < 3:
-            recommendations.append("Increase system monitoring frequency - reduced diagnostic coverage detected")
-            
-        # Planning recommendations
-        if any(p.get("payload", {}).get("verdict") == "REJECTED" for p in categories["planning"]):
-            recommendations.append("Review rejected plans - address high-risk factors before resubmission")
-            
-        return recommendations
-        
     def run(self):
         """Generate daily intelligence briefing"""
-        from datetime import timedelta
-        
         self.log("="*60)
         self.log("NEXUS SOVEREIGN - DAILY INTELLIGENCE BRIEFING")
         self.log("="*60)
         
-        # Fetch recent activity
-        entries = self.fetch_recent_activity()
-        self.log(f"Found {len(entries)} entries in last 24h")
-        
-        # Categorize
-        categories = self.categorize_activity(entries)
-        
-        # Generate summary
-        summary = self.generate_executive_summary(categories)
-        
+        # Prefer server-side aggregation: Postgres groups, we just format
+        counts = self.fetch_briefing_counts()
+
+        if counts is None:
+            # Fallback: pull everything and aggregate client-side in one pass
+            entries = self.fetch_recent_activity()
+            self.log(f"Found {len(entries)} entries in last 24h")
+            analysis = self.analyze_activity(entries)
+        else:
+            # Only the finding-bearing rows come down the wire
+            detail = self.analyze_activity(self.fetch_finding_entries())
+            breakdown = {k: counts.get(k, 0) for k in detail["breakdown"]}
+            analysis = self.summarize(
+                breakdown,
+                counts.get("planning_approved", 0),
+                counts.get("planning_rejected", 0),
+                detail["findings"]
+            )
+            self.log(f"Found {analysis['total_entries']} entries in last 24h")
+
         # Display summary
         self.log("\nEXECUTIVE SUMMARY:")
-        for line in summary:
+        for line in analysis["summary"]:
             self.log(f"  • {line}")
-            
+
         # Write briefing
-        self.write_intelligence_briefing(summary, categories)
-        
+        self.write_intelligence_briefing(analysis)
+
         # Display key findings
-        findings = self.extract_key_findings(categories)
-        if findings:
+        if analysis["findings"]:
             self.log("\nKEY FINDINGS:")
-            for finding in findings:
+            for finding in analysis["findings"]:
                 self.log(f"  • {finding}")
                 
         self.log("="*60)
         self.log("Briefing complete - check ledger for full report")
         self.log("="*60)
 
+        # One stdout write for the whole briefing
+        self.logger.flush()
+
 if __name__ == "__main__":
     reporter = ReporterAgent()
     reporter.run()
\ No newline at end of file
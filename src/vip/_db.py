@@ -0,0 +1,29 @@
+"""
+Shared Database Helper - One Supabase client for the whole organism
+Creating a client per call pays TLS + connection-pool setup every time;
+this caches one client per (url, key) and hands it out everywhere
+"""
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def get_client(url, key):
+    """Return a cached Supabase client, creating it on first use"""
+    from supabase import create_client
+
+    # Prefer a pooled keepalive transport so every request reuses a warm
+    # TLS stream; older client versions without httpx_client support fall
+    # back to the library defaults
+    try:
+        import httpx
+        from supabase import ClientOptions
+
+        pooled = httpx.Client(
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=50,
+                keepalive_expiry=30,
+            )
+        )
+        return create_client(url, key, options=ClientOptions(httpx_client=pooled))
+    except Exception:
+        return create_client(url, key)
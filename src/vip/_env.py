@@ -0,0 +1,17 @@
+"""
+Shared Environment Helper - config/.env parsed exactly once
+Every agent used to call load_dotenv itself, re-reading and re-parsing
+the same file at import (and once per subprocess spawn). Importing this
+module does it once per process and caches the resolved values as
+constants, so constructors stop paying os.getenv lookups too
+"""
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+_env_path = Path(__file__).parent.parent.parent / "config" / ".env"
+load_dotenv(_env_path)
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY")
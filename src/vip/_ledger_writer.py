@@ -0,0 +1,33 @@
+"""
+Ledger Writer - Write-behind buffer for Supabase inserts
+Queues rows and flushes them as one batched insert instead of paying a
+full round-trip per row; fan-out paths (votes, spawn reports) go 10-100x
+faster when N inserts collapse into ceil(N/100) requests
+"""
+import atexit
+
+FLUSH_THRESHOLD = 100
+
+class LedgerWriter:
+    def __init__(self, supabase, table="ledger", threshold=FLUSH_THRESHOLD):
+        self.supabase = supabase
+        self.table = table
+        self.threshold = threshold
+        self.rows = []
+        atexit.register(self.flush)
+
+    def append(self, row):
+        """Queue one row; auto-flush once the batch is full"""
+        self.rows.append(row)
+        if len(self.rows) >= self.threshold:
+            self.flush()
+
+    def flush(self):
+        """Send everything buffered in a single insert"""
+        if not self.rows:
+            return
+        rows, self.rows = self.rows, []
+        try:
+            self.supabase.table(self.table).insert(rows).execute()
+        except Exception as e:
+            print(f"[LedgerWriter] ERROR flushing {len(rows)} rows: {e}")
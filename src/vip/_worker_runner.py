@@ -0,0 +1,41 @@
+"""
+Worker Runner - Long-lived subprocess for the Incubator's warm pool
+Reads one JSON task spec per line on stdin, runs the named temp worker,
+and emits one JSON result line on stdout. Interpreter startup and the
+heavy imports are paid once per runner instead of once per spawn
+"""
+import sys
+import json
+import importlib
+import contextlib
+from pathlib import Path
+
+# Add src to path so worker modules resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+def main():
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            spec = json.loads(line)
+            if spec.get("op") == "exit":
+                break
+
+            module = importlib.import_module(spec["module"])
+            worker_class = getattr(module, spec["class"])
+            agent = worker_class(spec.get("params") or {})
+
+            # Worker logs go to stderr so stdout stays a clean result pipe
+            with contextlib.redirect_stdout(sys.stderr):
+                result = agent.execute()
+
+            print(json.dumps({"ok": True, "result": result}), flush=True)
+
+        except Exception as e:
+            print(json.dumps({"ok": False, "error": str(e)}), flush=True)
+
+if __name__ == "__main__":
+    main()
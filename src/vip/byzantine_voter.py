@@ -1,22 +1,43 @@
-import os
-from dotenv import load_dotenv
-from supabase import create_client
+import sys
+from pathlib import Path
 import hashlib
 import json
 
-load_dotenv('config/.env')
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
+from vip._ledger_writer import LedgerWriter
+
+supabase = get_client(SUPABASE_URL, SUPABASE_KEY)
+
+# Write-behind buffer: votes are batched into one insert per flush
+vote_writer = LedgerWriter(supabase, table='consensus_votes')
 
 MIN_AGENTS = 3
 CONFIDENCE_THRESHOLD = 0.8
 
+try:
+    import orjson
+
+    def _canonical_bytes(event_data):
+        """Canonical JSON bytes via orjson (Rust, ~5-10x faster than stdlib)"""
+        return orjson.dumps(event_data, option=orjson.OPT_SORT_KEYS)
+
+except ImportError:
+    def _canonical_bytes(event_data):
+        """Stdlib fallback producing the same compact UTF-8 encoding"""
+        return json.dumps(event_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode()
+
 def generate_event_hash(event_data):
-    """Create unique ID for an event"""
-    event_string = json.dumps(event_data, sort_keys=True)
-    return hashlib.md5(event_string.encode()).hexdigest()
+    """Create unique ID for an event (BLAKE2 over canonical JSON bytes)"""
+    # digest_size=16 keeps the hash the same width as the old md5 hex
+    return hashlib.blake2b(_canonical_bytes(event_data), digest_size=16).hexdigest()
 
 def cast_vote(agent_id, agent_type, event_data, confidence_score, vote_category):
     """Agent submits vote to consensus table"""
+    # Clamp to [0, 1]: the check_consensus short-circuit assumes no stored
+    # score can exceed 1.0
+    confidence_score = min(max(confidence_score, 0.0), 1.0)
     event_hash = generate_event_hash(event_data)
     
     vote = {
@@ -29,35 +50,93 @@ def cast_vote(agent_id, agent_type, event_data, confidence_score, vote_category)
         'vote_status': 'pending'
     }
     
-    supabase.table('consensus_votes').insert(vote).execute()
+    vote_writer.append(vote)
     print(f"Vote cast: {agent_type} -> {vote_category} (confidence: {confidence_score})")
     return event_hash
 
+# Confirmed events never un-confirm, so their results can be cached forever
+_consensus_cache = {}
+
 def check_consensus(event_hash):
     """Check if event reached Sovereign Truth (3+ agents, >0.8 confidence)"""
-    votes = supabase.table('consensus_votes').select('*').eq('event_hash', event_hash).execute()
-    
-    if len(votes.data) < MIN_AGENTS:
-        return False, f"Insufficient votes: {len(votes.data)}/{MIN_AGENTS}"
-    
-    avg_confidence = sum(v['confidence_score'] for v in votes.data) / len(votes.data)
-    
+    cached = _consensus_cache.get(event_hash)
+    if cached is not None:
+        return cached
+
+    # Only the score column is needed for the average
+    votes = supabase.table('consensus_votes').select('confidence_score').eq('event_hash', event_hash).execute()
+
+    n = len(votes.data)
+    if n < MIN_AGENTS:
+        return False, f"Insufficient votes: {n}/{MIN_AGENTS}"
+
+    # Online average with short-circuit: scores are clamped to [0, 1], so
+    # once even perfect remaining votes cannot lift the mean past the
+    # threshold there is no point finishing the sum
+    total = 0.0
+    for k, v in enumerate(votes.data, start=1):
+        total += v['confidence_score']
+        if (total + (n - k)) / n < CONFIDENCE_THRESHOLD:
+            return False, f"Low confidence: threshold unreachable after {k}/{n} votes"
+
+    avg_confidence = total / n
+
     if avg_confidence < CONFIDENCE_THRESHOLD:
         return False, f"Low confidence: {avg_confidence:.2f} < {CONFIDENCE_THRESHOLD}"
     
     # Mark as confirmed
     supabase.table('consensus_votes').update({'vote_status': 'confirmed'}).eq('event_hash', event_hash).execute()
-    return True, f"Sovereign Truth confirmed: {avg_confidence:.2f} confidence"
+    result = True, f"Sovereign Truth confirmed: {avg_confidence:.2f} confidence"
+    _consensus_cache[event_hash] = result
+    return result
+
+def sweep_pending_consensus():
+    """Resolve every pending event with one SELECT and one bulk UPDATE"""
+    votes = supabase.table('consensus_votes').select('event_hash, confidence_score').eq('vote_status', 'pending').execute()
+
+    # Group scores per event in a single pass
+    groups = {}
+    for v in votes.data:
+        groups.setdefault(v['event_hash'], []).append(v['confidence_score'])
+
+    results = {}
+    confirmed = []
+    for event_hash, scores in groups.items():
+        if len(scores) < MIN_AGENTS:
+            results[event_hash] = (False, f"Insufficient votes: {len(scores)}/{MIN_AGENTS}")
+            continue
+
+        avg_confidence = sum(scores) / len(scores)
+        if avg_confidence < CONFIDENCE_THRESHOLD:
+            results[event_hash] = (False, f"Low confidence: {avg_confidence:.2f} < {CONFIDENCE_THRESHOLD}")
+            continue
+
+        result = True, f"Sovereign Truth confirmed: {avg_confidence:.2f} confidence"
+        results[event_hash] = result
+        _consensus_cache[event_hash] = result
+        confirmed.append(event_hash)
+
+    # One bulk UPDATE for the whole confirmed batch
+    if confirmed:
+        supabase.table('consensus_votes').update({'vote_status': 'confirmed'}).in_('event_hash', confirmed).execute()
+
+    return results
 
 def get_pending_events():
-    """Get events awaiting consensus"""
-    votes = supabase.table('consensus_votes').select('event_hash').eq('vote_status', 'pending').execute()
-    return list(set(v['event_hash'] for v in votes.data))
+    """Get events awaiting consensus (deduped server-side)"""
+    try:
+        # SELECT DISTINCT via view (config/sql/pending_event_hashes.sql)
+        resp = supabase.table('pending_event_hashes').select('event_hash').execute()
+        return [r['event_hash'] for r in resp.data]
+    except Exception:
+        # View not installed - dedupe client-side as before
+        votes = supabase.table('consensus_votes').select('event_hash').eq('vote_status', 'pending').execute()
+        return list(set(v['event_hash'] for v in votes.data))
 
 if __name__ == "__main__":
-    # Test: Check all pending events
-    pending = get_pending_events()
-    print(f"Pending events: {len(pending)}")
-    for event_hash in pending:
-        is_truth, msg = check_consensus(event_hash)
+    # Test: Check all pending events in one sweep
+    vote_writer.flush()
+    results = sweep_pending_consensus()
+    print(f"Pending events: {len(results)}")
+    for event_hash, (is_truth, msg) in results.items():
         print(f"  {event_hash[:8]}...: {msg}")
\ No newline at end of file
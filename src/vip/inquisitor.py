@@ -2,43 +2,69 @@
 Inquisitor - Red Team Agent
 Challenges the General's plans to find flaws before execution
 """
-import os
 import sys
+import atexit
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv
+from collections import Counter
 
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
+from vip.survivor import BufferedLogger
+
+# Flush the ledger buffer once it holds this many rows
+MERGE_BATCH_LIMIT = 100
+
+# Verdict lookup indexed by min(high_risk_count, 2) - no branching
+_VERDICTS = (
+    ("APPROVED", "VERDICT: APPROVED", "Plan passes initial scrutiny"),
+    ("CONDITIONAL", "VERDICT: CONDITIONAL", "Address high-risk issue before proceeding"),
+    ("REJECTED", "!!! VERDICT: REJECTED !!!", "Plan has too many critical flaws"),
+)
 
 class Inquisitor:
     def __init__(self):
         self.agent_id = "inquisitor_001"
         self.agent_type = "validator"
         self.name = "Inquisitor"
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
-        
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_KEY
+        self._ledger_buffer = []
+        atexit.register(self.flush_ledger)
+        self.logger = BufferedLogger(f"[{self.name}] ")
+
     def log(self, message):
-        print(f"[{self.name}] {message}")
-        
+        self.logger.log(message)
+
     def write_to_ledger(self, message_type, payload):
-        """Write challenge results to ledger"""
+        """Buffer challenge results for the ledger (batched inserts)"""
+        self._ledger_buffer.append({
+            "agent_id": self.agent_id,
+            "agent_type": self.agent_type,
+            "message_type": message_type,
+            "payload": payload,
+            "status": "pending"
+        })
+        self.log(f"Queued for ledger: {message_type}")
+
+        if len(self._ledger_buffer) >= MERGE_BATCH_LIMIT:
+            self.flush_ledger()
+
+    def flush_ledger(self):
+        """Insert all buffered ledger rows in a single call"""
+        if not self._ledger_buffer:
+            return
+
+        rows = self._ledger_buffer
+        self._ledger_buffer = []
+
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
-            data = {
-                "agent_id": self.agent_id,
-                "agent_type": self.agent_type,
-                "message_type": message_type,
-                "payload": payload,
-                "status": "pending"
-            }
-            
-            supabase.table("ledger").insert(data).execute()
-            self.log(f"Written to ledger: {message_type}")
-            
+            supabase = get_client(self.supabase_url, self.supabase_key)
+            supabase.table("ledger").insert(rows).execute()
+            self.log(f"Flushed {len(rows)} entries to ledger")
+
         except Exception as e:
             self.log(f"ERROR: {e}")
             
@@ -90,16 +116,18 @@ class Inquisitor:
                 "recommendation": "Add 24-hour observation period"
             })
             
-        # If no challenges found, create generic ones
-        if len(challenges) < 3:
-            challenges.append({
-                "id": len(challenges)+1,
-                "category": "UNKNOWN",
-                "challenge": "Black swan events not accounted for",
-                "risk": "Unknown",
-                "recommendation": "Build contingency protocols"
-            })
-            
+        # Always append the generic fallback challenge; the [:3] display
+        # slice drops it whenever three real challenges exist, so this is
+        # branch-free and equivalent to the old conditional append
+        challenges.append({
+            "id": len(challenges)+1,
+            "category": "UNKNOWN",
+            "challenge": "Black swan events not accounted for",
+            "risk": "Unknown",
+            "recommendation": "Build contingency protocols"
+        })
+
+
         # Display challenges
         for c in challenges[:3]:  # Only top 3
             self.log(f"\nCHALLENGE #{c['id']} [{c['category']}]")
@@ -107,22 +135,15 @@ class Inquisitor:
             self.log(f"  Risk: {c['risk']}")
             self.log(f"  Fix: {c['recommendation']}")
             
-        # Verdict
-        high_risks = sum(1 for c in challenges if c['risk'] == 'High')
-        
-        if high_risks >= 2:
-            verdict = "REJECTED"
-            self.log(f"\n!!! VERDICT: {verdict} !!!")
-            self.log("Plan has too many critical flaws")
-        elif high_risks == 1:
-            verdict = "CONDITIONAL"
-            self.log(f"\nVERDICT: {verdict}")
-            self.log("Address high-risk issue before proceeding")
-        else:
-            verdict = "APPROVED"
-            self.log(f"\nVERDICT: {verdict}")
-            self.log("Plan passes initial scrutiny")
-            
+        # Verdict - one Counter pass, then a table lookup
+        risk_counts = Counter(c['risk'] for c in challenges)
+        high_risks = risk_counts['High']
+
+        verdict, header, note = _VERDICTS[min(high_risks, 2)]
+        self.log(f"\n{header}")
+        self.log(note)
+
+
         # Write to ledger
         result = {
             "plan_name": plan.get('name'),
@@ -133,8 +154,9 @@ class Inquisitor:
         }
         
         self.write_to_ledger("plan_validation", result)
-        
+
         self.log("="*50)
+        self.logger.flush()  # one stdout write for the whole validation
         return verdict, challenges[:3]
         
     def run_test(self):
@@ -160,6 +182,9 @@ class Inquisitor:
             self.challenge_plan(plan)
             print("\n")
 
+        # One batched insert for the whole session
+        self.flush_ledger()
+
 if __name__ == "__main__":
     inquisitor = Inquisitor()
     inquisitor.run_test()
\ No newline at end of file
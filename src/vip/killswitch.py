@@ -1,27 +1,57 @@
 import os
-from supabase import create_client
+import sys
+import time
+import signal
+from pathlib import Path
+
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
+
+# Cached at import so the hot path never re-reads the environment;
+# SIGHUP re-reads it for operators who flip the override live
+_OVERRIDE = os.getenv('SOVEREIGN_OVERRIDE', 'ACTIVE')
+
+def _reload_env(signum=None, frame=None):
+    global _OVERRIDE
+    _OVERRIDE = os.getenv('SOVEREIGN_OVERRIDE', 'ACTIVE')
+
+try:
+    signal.signal(signal.SIGHUP, _reload_env)
+except (AttributeError, ValueError):
+    pass  # No SIGHUP on this platform, or not the main thread
+
+# Remote check result is cached for this many seconds so a tight
+# polling loop hits the database at most once per window
+_DB_CHECK_TTL = 5.0
+_last_db_check = 0.0
+_last_db_clear = True
 
 def check_kill_switch():
     """Dead Man's Switch - returns False if system should halt"""
-    override = os.getenv('SOVEREIGN_OVERRIDE', 'ACTIVE')
-    
-    if override != 'ACTIVE':
+    if _OVERRIDE != 'ACTIVE':
         print("SOVEREIGN OVERRIDE: HALT signal detected. Shutting down.")
         return False
-    
-    # Also check Supabase for remote kill signal
+
+    # Also check Supabase for remote kill signal (TTL-cached)
+    global _last_db_check, _last_db_clear
+    now = time.monotonic()
+    if now - _last_db_check < _DB_CHECK_TTL:
+        return _last_db_clear
+    _last_db_check = now
+
     try:
-        supabase = create_client(
-            os.getenv('SUPABASE_URL'), 
-            os.getenv('SUPABASE_KEY')
-        )
+        supabase = get_client(SUPABASE_URL, SUPABASE_KEY)
         status = supabase.table('system_status').select('kill_signal').execute()
         if status.data and status.data[0].get('kill_signal') == 'HALT':
             print("REMOTE KILL: HALT signal in Ledger. Shutting down.")
+            _last_db_clear = False
             return False
     except:
         pass  # If can't reach DB, continue running (fail-safe)
-    
+
+    _last_db_clear = True
     return True
 
 if __name__ == "__main__":
@@ -29,4 +59,4 @@ if __name__ == "__main__":
         print("Kill switch: CLEAR. System operational.")
     else:
         print("Kill switch: TRIGGERED. Exit.")
-        exit(1)
\ No newline at end of file
+        exit(1)
@@ -5,20 +5,22 @@ VIP uses this to switch between Money, Discovery, and Survivor modes
 import os
 import sys
 import time
-import psutil
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv
 
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
 
 class ModeManager:
     def __init__(self):
         self.name = "ModeManager"
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_KEY
         self.current_mode = "discovery"  # Default
+        # Pause between test switches; FAST_TEST=1 drops it for CI runs
+        self.switch_interval = 0.0 if os.getenv("FAST_TEST") else 2.0
         self.modes = {
             "money": self._enter_money_mode,
             "discovery": self._enter_discovery_mode,
@@ -31,9 +33,8 @@ class ModeManager:
     def get_system_status(self):
         """Read current mode from database"""
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
             result = supabase.table("system_status")\
                 .select("*")\
                 .order("created_at", desc=True)\
@@ -62,9 +63,9 @@ class ModeManager:
         
         # Update database
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
+            import psutil  # deferred - only needed when a switch happens
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
             supabase.table("system_status").insert({
                 "current_mode": new_mode,
                 "agent_health": {"previous_mode": self.current_mode, "reason": reason},
@@ -115,6 +116,7 @@ class ModeManager:
         
     def check_auto_switch(self):
         """Auto-switch modes based on conditions"""
+        import psutil  # deferred - keeps module import light
         cpu = psutil.cpu_percent()
         # TODO: Check for 429 errors, system health, etc.
         
@@ -130,13 +132,13 @@ class ModeManager:
         self.log(f"Current mode: {self.current_mode}")
         
         # Test switches
-        time.sleep(2)
+        time.sleep(self.switch_interval)
         self.set_mode("money", "High volatility detected")
-        
-        time.sleep(2)
+
+        time.sleep(self.switch_interval)
         self.set_mode("discovery", "Market closed, researching")
-        
-        time.sleep(2)
+
+        time.sleep(self.switch_interval)
         self.set_mode("survivor", "429 errors detected, stealth mode")
 
 if __name__ == "__main__":
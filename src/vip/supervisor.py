@@ -2,21 +2,20 @@
 VIP Supervisor - The Central Brain of Nexus Sovereign
 Level 0: Manages system health, budget ($0), and API limits
 """
-import os
 import sys
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
 
 class VIPSupervisor:
     def __init__(self):
         self.name = "VIP_Supervisor"
         self.status = "INITIALIZING"
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_KEY
         
     def check_environment(self):
         """Verify all required components are present"""
@@ -40,10 +39,8 @@ class VIPSupervisor:
     def check_database(self):
         """Test connection to Supabase Ledger"""
         try:
-            from supabase import create_client
-            
             print(f"[{self.name}] Connecting to Ledger...")
-            supabase = create_client(self.supabase_url, self.supabase_key)
+            supabase = get_client(self.supabase_url, self.supabase_key)
             
             # Test query - count rows in ledger
             response = supabase.table("ledger").select("*", count="exact").limit(0).execute()
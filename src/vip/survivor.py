@@ -2,23 +2,73 @@
 Survivor Organ - Black Box Logger
 Records all system events locally for debugging and recovery
 """
+import io
+import sys
 import json
 import os
+import time
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+    def _dumps(obj):
+        return orjson.dumps(obj)
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+class BufferedLogger:
+    """Collects an agent's log lines in memory and emits them with a single
+    stdout write instead of one syscall per print. Safe to share across
+    threads (the incubator logs from its spawn pool)"""
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+        self.buf = io.StringIO()
+        self._lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def log(self, message):
+        with self._lock:
+            self.buf.write(f"{self.prefix}{message}\n")
+
+    def flush(self):
+        """Emit everything buffered in one write"""
+        with self._lock:
+            pending = self.buf.getvalue()
+            self.buf.seek(0)
+            self.buf.truncate()
+        if pending:
+            sys.stdout.write(pending)
+            sys.stdout.flush()
+
 class SurvivorOrgan:
     def __init__(self):
         self.log_dir = Path(__file__).parent.parent.parent / "logs"
         self.log_dir.mkdir(exist_ok=True)
         self.log_file = self.log_dir / f"survivor_{datetime.now().strftime('%Y%m%d')}.log"
-        
+
+        # One persistent buffered handle instead of open/write/close per event
+        self._fh = open(self.log_file, "ab", buffering=1 << 16)
+        atexit.register(self.close)
+
+    def flush(self):
+        """Push buffered entries to disk"""
+        self._fh.flush()
+
+    def close(self):
+        """Flush and close the log file"""
+        if not self._fh.closed:
+            self._fh.close()
+
     def log(self, level, agent, message, data=None):
         """Write a log entry"""
-        timestamp = datetime.now().isoformat()
-        
+        # Integer nanoseconds: far cheaper than datetime.now().isoformat()
+        # per event; format for humans only when reading the log back
         entry = {
-            "timestamp": timestamp,
+            "timestamp": time.time_ns(),
             "level": level,
             "agent": agent,
             "message": message,
@@ -26,9 +76,8 @@ class SurvivorOrgan:
         }
         
         # Write to file
-        with open(self.log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
-            
+        self._fh.write(_dumps(entry) + b"\n")
+
         # Also print to console
         print(f"[SURVIVOR] [{level}] {agent}: {message}")
         
@@ -2,64 +2,133 @@
 Base Worker - All workers inherit from this
 Provides ledger writing and logging capabilities
 """
-import os
 import sys
+import time
+import atexit
+import threading
 from pathlib import Path
-from datetime import datetime
-from dotenv import load_dotenv
+from datetime import datetime, timedelta
 
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
+
+# Flush the ledger buffer once it holds this many rows
+MERGE_BATCH_LIMIT = 100
+
+# Without Realtime, re-query the kill signal at most this often (seconds)
+KILL_POLL_TTL = 30
 
 class BaseWorker:
     def __init__(self, agent_id, agent_type):
         self.agent_id = agent_id
         self.agent_type = agent_type
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
-        
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_KEY
+        self._ledger_buffer = []
+        atexit.register(self.flush_ledger)
+        self._kill = threading.Event()
+        self._kill_channel = None
+        self._kill_last_poll = 0.0
+
     def log(self, message):
         """Print to console with agent ID"""
         print(f"[{self.agent_id}] {message}")
-        
+
     def write_to_ledger(self, message_type, payload):
-        """Write entry to Supabase ledger"""
+        """Buffer entry for the Supabase ledger (batched inserts)"""
+        data = {
+            "agent_id": self.agent_id,
+            "agent_type": self.agent_type,
+            "message_type": message_type,
+            "payload": payload,
+            "status": "pending"
+        }
+
+        self._ledger_buffer.append(data)
+        self.log(f"Queued for ledger: {message_type}")
+
+        if len(self._ledger_buffer) >= MERGE_BATCH_LIMIT:
+            return self.flush_ledger()
+        return True
+
+    def flush_ledger(self):
+        """Insert all buffered ledger rows in a single call"""
+        if not self._ledger_buffer:
+            return True
+
+        rows = self._ledger_buffer
+        self._ledger_buffer = []
+
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
-            data = {
-                "agent_id": self.agent_id,
-                "agent_type": self.agent_type,
-                "message_type": message_type,
-                "payload": payload,
-                "status": "pending"
-            }
-            
-            result = supabase.table("ledger").insert(data).execute()
-            self.log(f"Written to ledger: {message_type}")
+            supabase = get_client(self.supabase_url, self.supabase_key)
+            supabase.table("ledger").insert(rows).execute()
+            self.log(f"Flushed {len(rows)} entries to ledger")
             return True
-            
+
         except Exception as e:
-            self.log(f"ERROR writing to ledger: {e}")
+            self.log(f"ERROR flushing ledger: {e}")
             return False
             
+    def _on_kill_insert(self, payload):
+        """Realtime callback - flip the kill flag on a VIP SHUTDOWN insert"""
+        record = payload.get("data", {}).get("record") or payload.get("new") or {}
+        if record.get("agent_id") == "VIP" and record.get("message_type") == "SHUTDOWN":
+            self._kill.set()
+
+    def subscribe_kill_signal(self):
+        """Subscribe to VIP shutdown inserts via Supabase Realtime (push, no polling)"""
+        try:
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
+            self._kill_channel = supabase.channel(f"kill_{self.agent_id}")
+            self._kill_channel.on_postgres_changes(
+                event="INSERT",
+                schema="public",
+                table="ledger",
+                callback=self._on_kill_insert
+            )
+            self._kill_channel.subscribe()
+
+            self.log("Realtime kill-signal subscription active")
+            return True
+
+        except Exception as e:
+            self.log(f"Realtime unavailable ({e}), falling back to polling")
+            return False
+
     def check_kill_signal(self):
         """Check if VIP has issued shutdown command"""
+        # Push path: the Realtime callback already set the flag
+        if self._kill.is_set():
+            return True
+        if self._kill_channel is not None:
+            return False
+
+        # Poll path: cache the answer so we query at most once per TTL
+        now = time.monotonic()
+        if now - self._kill_last_poll < KILL_POLL_TTL:
+            return False
+        self._kill_last_poll = now
+
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
             # Check for shutdown signal in last 60 seconds
+            # head=True returns only the count header - no rows on the wire
+            since = (datetime.utcnow() - timedelta(seconds=60)).isoformat()
             result = supabase.table("ledger")\
-                .select("*")\
+                .select("id", count="exact", head=True)\
                 .eq("agent_id", "VIP")\
                 .eq("message_type", "SHUTDOWN")\
-                .gte("created_at", (datetime.now().timestamp() - 60))\
+                .gte("created_at", since)\
                 .execute()
-                
-            return len(result.data) > 0
-            
+
+            if result.count and result.count > 0:
+                self._kill.set()
+            return self._kill.is_set()
+
         except:
             return False
             
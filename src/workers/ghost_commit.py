@@ -2,51 +2,83 @@
 Ghost-Commit Agent - Real GitHub Repository Hunter
 Tracks actual commits, repos, and security issues at major tech companies
 """
-import os
+import re
 import sys
 import time
+import random
+import threading
 from pathlib import Path
-from datetime import datetime
-from dotenv import load_dotenv
-from github import Github
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from workers.base_worker import BaseWorker
 
-class GhostCommitAgent:
+# Concurrency and pacing for the unauthenticated GitHub API budget
+SCAN_WORKERS = 8
+SCAN_INTERVAL = 2   # fallback spacing when rate-limit headroom is unknown
+BACKOFF_BASE = 2.0  # exponential backoff on rate-limit rejections
+BACKOFF_CAP = 60.0
+SCAN_RETRIES = 3
+
+# Compiled once; a single case-insensitive regex pass replaces per-keyword
+# substring scans and the .lower() allocation per string
+_SECRET_RE = re.compile(r"api-key|password|secret|internal|private", re.IGNORECASE)
+_COMMIT_RE = re.compile(r"fix|patch|security|urgent", re.IGNORECASE)
+
+class GhostCommitAgent(BaseWorker):
     def __init__(self):
-        self.agent_id = "ghost_commit_001"
-        self.agent_type = "hunter"
+        super().__init__("ghost_commit_001", "hunter")
         self.name = "Ghost-Commit"
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
-        
+
         # Initialize GitHub API (public access, no token needed for basic queries)
-        self.github = Github()  # Public API access
-        
+        # PyGithub is heavy; import it only when an agent is actually built.
+        # per_page sized to what we actually consume so each listing is one page
+        from github import Github
+        self.github = Github(per_page=10)
+
+        # Token-bucket style gate so parallel scans stay inside rate limits
+        self._rate_lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def _pacing_delay(self):
+        """Spread the remaining API budget evenly over the reset window"""
+        try:
+            remaining, _ = self.github.rate_limiting
+            window = max(0.0, self.github.rate_limiting_resettime - time.time())
+            if remaining <= 0:
+                return min(window, BACKOFF_CAP)
+            return min(window / remaining, BACKOFF_CAP)
+        except Exception:
+            return SCAN_INTERVAL
+
+    def _throttled_scan(self, org_name):
+        """Rate-gated wrapper around scan_github_org for the thread pool"""
+        with self._rate_lock:
+            wait = self._next_slot - time.monotonic()
+            self._next_slot = max(self._next_slot, time.monotonic()) + self._pacing_delay()
+        if wait > 0:
+            time.sleep(wait)
+
+        result = self.scan_github_org(org_name)
+
+        # Retry rate-limit rejections with exponential backoff + jitter
+        for attempt in range(SCAN_RETRIES):
+            error = str(result.get("error", ""))
+            if result.get("status") != "failed" or "rate" not in error.lower():
+                break
+            delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt) + random.uniform(0, 1)
+            self.log(f"Rate limited on {org_name}, backing off {delay:.1f}s")
+            time.sleep(delay)
+            result = self.scan_github_org(org_name)
+
+        return result
+
     def log(self, message):
         print(f"[{self.name}] {message}")
-        
-    def write_to_ledger(self, message_type, payload):
-        """Write findings to ledger"""
-        try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
-            data = {
-                "agent_id": self.agent_id,
-                "agent_type": self.agent_type,
-                "message_type": message_type,
-                "payload": payload,
-                "status": "pending"
-            }
-            
-            supabase.table("ledger").insert(data).execute()
-            self.log(f"Written to ledger: {message_type}")
-            
-        except Exception as e:
-            self.log(f"ERROR writing to ledger: {e}")
-            
+
     def scan_github_org(self, org_name):
         """Scan real GitHub organization for repository activity"""
         self.log(f"HUNTING: {org_name} on GitHub")
@@ -55,33 +87,42 @@ class GhostCommitAgent:
             org = self.github.get_organization(org_name)
             
             # Get recent repositories (last 30 days)
-            repos = []
+            # SoA layout: parallel lists instead of a dict per repo; the
+            # dict view is materialized only for the JSON payload below
+            names, updates, stars, forks, langs, descs = [], [], [], [], [], []
             secret_keywords = []
             suspicious_commits = []
-            
-            for repo in org.get_repos(sort="updated", direction="desc")[:10]:
-                repo_data = {
-                    "name": repo.name,
-                    "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
-                    "stars": repo.stargazers_count,
-                    "forks": repo.forks_count,
-                    "language": repo.language,
-                    "description": repo.description or ""
-                }
-                repos.append(repo_data)
-                
+            commit_candidates = []
+            # Aware UTC cutoff: PyGithub 2.x returns aware datetimes and
+            # comparing them against a naive one raises TypeError
+            cutoff = datetime.now(timezone.utc) - timedelta(days=7)
+
+            # Pass 1: metadata only - description checks are free, commit
+            # fetches are not, so just decide which repos deserve one
+            for repo in islice(org.get_repos(sort="updated", direction="desc"), 10):
+                names.append(repo.name)
+                updates.append(repo.updated_at.isoformat() if repo.updated_at else None)
+                stars.append(repo.stargazers_count)
+                forks.append(repo.forks_count)
+                langs.append(repo.language)
+                descs.append(repo.description or "")
+
                 # Check description for security keywords
-                if repo.description:
-                    desc_lower = repo.description.lower()
-                    if any(keyword in desc_lower for keyword in ['api-key', 'password', 'secret', 'internal', 'private']):
-                        secret_keywords.append(repo.name)
-                        
-                # Check recent commits for suspicious activity
+                flagged = bool(repo.description and _SECRET_RE.search(repo.description))
+                if flagged:
+                    secret_keywords.append(repo.name)
+
+                # pushed_at is already in the listing response - no extra call
+                if flagged or (repo.pushed_at and repo.pushed_at >= cutoff):
+                    commit_candidates.append(repo)
+
+            # Pass 2: fetch commits only for flagged or recently-pushed repos
+            for repo in commit_candidates:
                 try:
-                    commits = repo.get_commits(since=datetime.now() - timedelta(days=7))[:5]
+                    # get_page(0) forces exactly one HTTP page instead of lazy slicing
+                    commits = repo.get_commits(since=cutoff).get_page(0)[:5]
                     for commit in commits:
-                        commit_msg = commit.commit.message.lower()
-                        if any(keyword in commit_msg for keyword in ['fix', 'patch', 'security', 'urgent']):
+                        if _COMMIT_RE.search(commit.commit.message):
                             suspicious_commits.append({
                                 "repo": repo.name,
                                 "message": commit.commit.message[:100],
@@ -100,16 +141,22 @@ class GhostCommitAgent:
             findings = {
                 "org": org_name,
                 "timestamp": datetime.now().isoformat(),
-                "new_repos": len(repos),
-                "repos": repos[:5],  # First 5 only
+                "new_repos": len(names),
+                # Materialize the dict view only for the rows we actually ship
+                "repos": [
+                    {"name": n, "updated_at": u, "stars": s, "forks": f,
+                     "language": l, "description": d}
+                    for n, u, s, f, l, d in zip(names[:5], updates[:5], stars[:5],
+                                                forks[:5], langs[:5], descs[:5])
+                ],
                 "secret_keywords": secret_keywords,
                 "suspicious_commits": suspicious_commits[:3],  # First 3 only
                 "alert_level": alert_level,
-                "total_stars": sum(repo["stars"] for repo in repos),
-                "primary_language": repos[0]["language"] if repos else "Unknown"
+                "total_stars": sum(stars),  # C-level sum over a flat int list
+                "primary_language": langs[0] if langs else "Unknown"
             }
-            
-            self.log(f"Found: {len(repos)} repos | {len(secret_keywords)} security issues | {len(suspicious_commits)} suspicious commits")
+
+            self.log(f"Found: {len(names)} repos | {len(secret_keywords)} security issues | {len(suspicious_commits)} suspicious commits")
             
             return findings
             
@@ -144,27 +191,36 @@ class GhostCommitAgent:
         ]
         
         all_findings = []
-        
-        for target in targets:
-            self.log(f"\n--- HUNTING {target.upper()} ---")
-            result = self.scan_github_org(target)
-            all_findings.append(result)
-            
-            # Write appropriate alert level
-            if result.get("alert_level") == "HIGH":
-                self.write_to_ledger("security_alert", result)
-            elif result.get("alert_level") in ["MEDIUM", "LOW"]:
-                self.write_to_ledger("github_scan", result)
-            else:
-                self.write_to_ledger("github_error", result)
-                
-            self.log(f"Completed hunt for {target}")
-            time.sleep(2)  # Rate limiting
-            
-        # Summary
-        high_alerts = sum(1 for f in all_findings if f.get("alert_level") == "HIGH")
-        total_repos = sum(f.get("new_repos", 0) for f in all_findings)
-        total_secrets = sum(len(f.get("secret_keywords", [])) for f in all_findings)
+
+        # Scans are pure network I/O, so overlap them across a thread pool
+        with ThreadPoolExecutor(max_workers=SCAN_WORKERS) as executor:
+            futures = {executor.submit(self._throttled_scan, target): target
+                       for target in targets}
+
+            for future in as_completed(futures):
+                target = futures[future]
+                result = future.result()
+                all_findings.append(result)
+
+                # Write appropriate alert level
+                if result.get("alert_level") == "HIGH":
+                    self.write_to_ledger("security_alert", result)
+                elif result.get("alert_level") in ["MEDIUM", "LOW"]:
+                    self.write_to_ledger("github_scan", result)
+                else:
+                    self.write_to_ledger("github_error", result)
+
+                self.log(f"Completed hunt for {target}")
+
+        # One batched insert for the whole hunt
+        self.flush_ledger()
+
+        # Summary - single fused pass instead of three generator scans
+        high_alerts = total_repos = total_secrets = 0
+        for f in all_findings:
+            high_alerts += f.get("alert_level") == "HIGH"
+            total_repos += f.get("new_repos", 0)
+            total_secrets += len(f.get("secret_keywords", ()))
         
         self.log("="*50)
         self.log(f"HUNT COMPLETE: {len(targets)} orgs scanned")
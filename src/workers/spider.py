@@ -2,65 +2,146 @@
 Spider Worker - Web scraping agent with kill-signal listener
 Level 2: Specialized organ for data collection
 """
-import os
+import re
 import sys
 import time
-import threading
 from pathlib import Path
-from datetime import datetime
-from dotenv import load_dotenv
+from datetime import datetime, timedelta
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
 
-env_path = Path(__file__).parent.parent.parent / "config" / ".env"
-load_dotenv(env_path)
+# selectolax parses in C and is an order of magnitude faster than
+# BeautifulSoup + html.parser; fall back to bs4 when it is missing
+try:
+    from selectolax.parser import HTMLParser
+
+    def _parse_page(content):
+        """Return (title, links, image_count, text_length) for a page"""
+        tree = HTMLParser(content)
+        title_node = tree.css_first('title')
+        title = title_node.text() if title_node else 'No title'
+        links = [a.attributes.get('href') for a in tree.css('a')
+                 if a.attributes.get('href')]
+        return title, links, len(tree.css('img')), len(tree.text())
+
+except ImportError:
+    from bs4 import BeautifulSoup
+
+    def _parse_page(content):
+        """Return (title, links, image_count, text_length) for a page"""
+        soup = BeautifulSoup(content, 'html.parser')
+        title = soup.find('title').get_text() if soup.find('title') else 'No title'
+        links = [a.get('href') for a in soup.find_all('a') if a.get('href')]
+        return title, links, len(soup.find_all('img')), len(soup.get_text())
+
+# Add src to path so shared VIP helpers resolve
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from vip._db import get_client
+from vip._env import SUPABASE_URL, SUPABASE_KEY
+
+# One pooled keep-alive session for every scan instead of a fresh
+# TCP+TLS connection per requests.get
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+# One compiled pass over the raw bytes replaces three lowercased copies
+# of the body plus three substring scans
+_SEC_RE = re.compile(rb'(api-key|password|internal)', re.IGNORECASE)
+_SEC_KEYS = {
+    b'api-key': 'api_key_exposed',
+    b'password': 'password_mentioned',
+    b'internal': 'internal_reference',
+}
+
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16,
+                       max_retries=Retry(total=3, backoff_factor=0.3))
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
 
 class SpiderWorker:
     def __init__(self):
         self.agent_id = "spider_001"
         self.agent_type = "worker"
         self.name = "Spider"
-        self.supabase_url = os.getenv("SUPABASE_URL")
-        self.supabase_key = os.getenv("SUPABASE_KEY")
+        self.supabase_url = SUPABASE_URL
+        self.supabase_key = SUPABASE_KEY
         self.running = True
         self.kill_check_interval = 60  # Check every 60 seconds
-        
+        self._kill_channel = None
+        self._last_kill_check = 0.0
+
     def log(self, message):
         print(f"[{self.name}] {message}")
-        
+
+    def _on_kill_insert(self, payload):
+        """Realtime callback - stop the worker on a VIP SHUTDOWN insert"""
+        record = payload.get("data", {}).get("record") or payload.get("new") or {}
+        if record.get("agent_id") == "VIP" and record.get("message_type") == "SHUTDOWN":
+            self.log("!!! KILL SIGNAL RECEIVED FROM VIP !!!")
+            self.log("Shutting down...")
+            self.running = False
+
+    def subscribe_kill_signal(self):
+        """Subscribe to VIP shutdown inserts via Supabase Realtime (push, no polling)"""
+        try:
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
+            self._kill_channel = supabase.channel("spider_kill")
+            self._kill_channel.on_postgres_changes(
+                event="INSERT",
+                schema="public",
+                table="ledger",
+                callback=self._on_kill_insert
+            )
+            self._kill_channel.subscribe()
+
+            self.log("Realtime kill-signal subscription active")
+            return True
+
+        except Exception as e:
+            self.log(f"Realtime unavailable ({e}), falling back to polling")
+            return False
+
+    def _is_killed(self):
+        """Single-shot check for a VIP shutdown command"""
+        try:
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
+            # Check for SHUTDOWN signal from VIP in last 2 minutes
+            # head=True returns just the count header - no rows, no parse
+            since = (datetime.utcnow() - timedelta(minutes=2)).isoformat()
+            result = supabase.table("ledger")\
+                .select("id", count="exact", head=True)\
+                .eq("agent_id", "VIP")\
+                .eq("message_type", "SHUTDOWN")\
+                .eq("status", "active")\
+                .gte("created_at", since)\
+                .execute()
+
+            return bool(result.count and result.count > 0)
+
+        except Exception:
+            return False  # Silent fail, retry next cycle
+
     def check_kill_signal(self):
-        """Check if VIP has issued shutdown command - runs every 60s"""
-        while self.running:
-            try:
-                from supabase import create_client
-                supabase = create_client(self.supabase_url, self.supabase_key)
-                
-                # Check for SHUTDOWN signal from VIP in last 2 minutes
-                result = supabase.table("ledger")\
-                    .select("*")\
-                    .eq("agent_id", "VIP")\
-                    .eq("message_type", "SHUTDOWN")\
-                    .eq("status", "active")\
-                    .execute()
-                    
-                if len(result.data) > 0:
-                    self.log("!!! KILL SIGNAL RECEIVED FROM VIP !!!")
-                    self.log("Shutting down immediately...")
-                    self.running = False
-                    sys.exit(0)
-                    
-            except Exception as e:
-                pass  # Silent fail, retry next cycle
-                
-            # Wait 60 seconds before next check
-            time.sleep(self.kill_check_interval)
-            
+        """Inline poll: query at most once per kill_check_interval"""
+        if self._kill_channel is not None:
+            return  # Realtime push handles it
+        if time.monotonic() - self._last_kill_check < self.kill_check_interval:
+            return
+        self._last_kill_check = time.monotonic()
+
+        if self._is_killed():
+            self.log("!!! KILL SIGNAL RECEIVED FROM VIP !!!")
+            self.log("Shutting down...")
+            self.running = False
+
     def write_to_ledger(self, message_type, payload):
         """Write a message to the central ledger"""
         try:
-            from supabase import create_client
-            supabase = create_client(self.supabase_url, self.supabase_key)
-            
+            supabase = get_client(self.supabase_url, self.supabase_key)
+
             data = {
                 "agent_id": self.agent_id,
                 "agent_type": self.agent_type,
@@ -82,30 +163,18 @@ class SpiderWorker:
         self.log(f"REAL SCAN: {url}")
         
         try:
-            # Real HTTP request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            # Parse real HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Real HTTP request over the pooled session
+            response = _session.get(url, headers=_HEADERS, timeout=10)
             
-            # Extract real data
-            title = soup.find('title').get_text() if soup.find('title') else 'No title'
-            links = [a.get('href') for a in soup.find_all('a') if a.get('href')]
-            images = len(soup.find_all('img'))
-            text_length = len(soup.get_text())
+            # Parse real HTML and extract real data
+            title, links, images, text_length = _parse_page(response.content)
             
-            # Check for real security issues
-            security_findings = []
-            if 'api-key' in response.text.lower():
-                security_findings.append('api_key_exposed')
-            if 'password' in response.text.lower():
-                security_findings.append('password_mentioned')
-            if 'internal' in response.text.lower():
-                security_findings.append('internal_reference')
-                
+            # Check for real security issues - single scan of the raw body
+            found = {m.group(1).lower() for m in _SEC_RE.finditer(response.content)}
+            security_findings = [_SEC_KEYS[k] for k in (b'api-key', b'password', b'internal')
+                                 if k in found]
+
+
             report = {
                 "url": url,
                 "timestamp": datetime.now().isoformat(),
@@ -136,11 +205,10 @@ class SpiderWorker:
     def run(self):
         """Main execution with kill-signal listener"""
         self.log("Worker starting...")
-        self.log("Kill-signal listener active (checking every 60s)")
-        
-        # Start kill-signal checker in background thread
-        kill_thread = threading.Thread(target=self.check_kill_signal, daemon=True)
-        kill_thread.start()
+
+        # Push-based kill signal; inline TTL poll only if Realtime is down
+        if not self.subscribe_kill_signal():
+            self.log("Kill-signal poll active (inline, every 60s)")
         
         # Main work loop
         try:
@@ -155,6 +223,7 @@ class SpiderWorker:
                 ]
                 
                 for url in test_urls:
+                    self.check_kill_signal()
                     if not self.running:
                         break
                     result = self.scan_target(url)
@@ -0,0 +1,38 @@
+"""
+Temp Geologist - Incubator-spawned mining/resource researcher
+Runs in-process and is discarded when the task is done
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from workers.base_worker import BaseWorker
+
+class TempGeologist(BaseWorker):
+    def __init__(self, params=None):
+        super().__init__("temp_geologist", "geologist")
+        params = params or {}
+        self.resource = params.get("resource", "lithium")
+        self.location = params.get("location", "Chile")
+
+    def execute(self):
+        self.log(f"Researching {self.resource} in {self.location}")
+        # Simulate research
+        time.sleep(2)
+
+        findings = {
+            "resource": self.resource,
+            "location": self.location,
+            "reserves": "High",
+            "extraction_cost": "$3,200/ton",
+            "regulatory_status": "Permits required"
+        }
+
+        self.write_to_ledger("geology_report", findings)
+        self.log("Task complete")
+        return findings
+
+if __name__ == "__main__":
+    agent = TempGeologist()
+    agent.execute()
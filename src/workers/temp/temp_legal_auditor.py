@@ -0,0 +1,38 @@
+"""
+Temp Legal Auditor - Incubator-spawned legal researcher
+Runs in-process and is discarded when the task is done
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from workers.base_worker import BaseWorker
+
+class TempLegalAuditor(BaseWorker):
+    def __init__(self, params=None):
+        super().__init__("temp_legal", "legal_auditor")
+        params = params or {}
+        self.topic = params.get("topic", "mining_law")
+        self.jurisdiction = params.get("jurisdiction", "Chile")
+
+    def execute(self):
+        self.log(f"Auditing {self.topic} in {self.jurisdiction}")
+        # Simulate research
+        time.sleep(2)
+
+        findings = {
+            "topic": self.topic,
+            "jurisdiction": self.jurisdiction,
+            "compliance_required": True,
+            "key_statutes": ["Law 18.248", "Decree 132"],
+            "risk_level": "Medium"
+        }
+
+        self.write_to_ledger("legal_report", findings)
+        self.log("Task complete")
+        return findings
+
+if __name__ == "__main__":
+    agent = TempLegalAuditor()
+    agent.execute()
@@ -0,0 +1,35 @@
+"""
+Temp Market Scanner - Incubator-spawned rapid market analyst
+Runs in-process and is discarded when the task is done
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+from workers.base_worker import BaseWorker
+
+class TempMarketScanner(BaseWorker):
+    def __init__(self, params=None):
+        super().__init__("temp_market", "market_scanner")
+        params = params or {}
+        self.symbol = params.get("symbol", "BTC")
+
+    def execute(self):
+        self.log(f"Scanning market for {self.symbol}")
+        time.sleep(1)
+
+        data = {
+            "symbol": self.symbol,
+            "price": 42000,
+            "trend": "bullish",
+            "volume": "high"
+        }
+
+        self.write_to_ledger("market_scan", data)
+        self.log("Task complete")
+        return data
+
+if __name__ == "__main__":
+    agent = TempMarketScanner()
+    agent.execute()
@@ -2,41 +2,88 @@ import sys
 sys.path.insert(0, 'src/vip')
 from killswitch import check_kill_switch
 from byzantine_voter import cast_vote, generate_event_hash
+from _db import get_client
+from _env import SUPABASE_URL, SUPABASE_KEY, ETHERSCAN_API_KEY
 
-import os, requests
-from dotenv import load_dotenv
-from supabase import create_client
-import time
+import time, asyncio, aiohttp
 
-load_dotenv('config/.env')
-supabase = create_client(os.getenv('SUPABASE_URL'), os.getenv('SUPABASE_KEY'))
-api_key = os.getenv('ETHERSCAN_API_KEY')
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    import json
+    _loads = json.loads
+
+supabase = get_client(SUPABASE_URL, SUPABASE_KEY)
+api_key = ETHERSCAN_API_KEY
+
+ETHERSCAN_RATE = 5  # Free-tier limit: 5 requests per second
+
+# Wallet directory changes rarely; cache it between runs
+WALLET_TTL = 300  # seconds
+_wallet_cache = {'data': None, 'ts': 0.0}
+
+def _get_wallets():
+    """Return the wallet directory, re-querying at most once per TTL"""
+    now = time.time()
+    if _wallet_cache['data'] is None or now - _wallet_cache['ts'] > WALLET_TTL:
+        # Only the two columns the scan actually reads
+        _wallet_cache['data'] = supabase.table('wallet_directory')\
+            .select('address,entity_name').execute().data
+        _wallet_cache['ts'] = now
+    return _wallet_cache['data']
+
+# URL skeleton built once; per-wallet we only splice in the address
+_URL_TMPL = ("https://api.etherscan.io/v2/api?chainid=1&module=account"
+             "&action=tokentx&address={addr}&page=1&offset=20&sort=desc"
+             "&apikey=" + (api_key or ""))
+
+async def _fetch_one(session, wallet, sem):
+    """Fetch one wallet's recent token transfers, rate-limited by sem"""
+    url = _URL_TMPL.format(addr=wallet['address'])
+    async with sem:
+        async with session.get(url) as r:
+            data = _loads(await r.read())
+        # Hold the slot briefly so at most ETHERSCAN_RATE calls start per second
+        await asyncio.sleep(1.0 / ETHERSCAN_RATE)
+    return wallet, data
+
+async def _fetch_all(wallet_rows):
+    """Issue all Etherscan fetches concurrently under the rate limit"""
+    sem = asyncio.Semaphore(ETHERSCAN_RATE)
+    async with aiohttp.ClientSession() as session:
+        return await asyncio.gather(
+            *(_fetch_one(session, w, sem) for w in wallet_rows))
+
+# Stablecoin decimal scales, fixed per token: USDT/USDC carry 6 decimals,
+# the rest 18. One dict lookup replaces the tokenDecimal parse and 10**n
+_SCALE = {'USDT': 1e-6, 'USDC': 1e-6, 'BUSD': 1e-18, 'DAI': 1e-18, 'TUSD': 1e-18}
 
 def fetch_whale_tx(min_usd=10000000):
     """Fetch transactions > $10M USD and cast votes"""
-    stablecoins = {'USDT', 'USDC', 'DAI', 'BUSD', 'TUSD'}
-    
-    wallets = supabase.table('wallet_directory').select('*').execute()
-    
-    for wallet in wallets.data:
-        url = f"https://api.etherscan.io/v2/api?chainid=1&module=account&action=tokentx&address={wallet['address']}&page=1&offset=20&sort=desc&apikey={api_key}"
-        r = requests.get(url).json()
-        
+    alerts = []
+
+    # All HTTP up front and concurrent; processing below is pure CPU + DB
+    results = asyncio.run(_fetch_all(_get_wallets()))
+
+    # Single filtering pass over the flattened tx stream, cheapest test
+    # first: the set lookup culls most rows before any int parsing
+    for wallet, r in results:
         if r['status'] != '1':
             continue
-            
+
         for tx in r['result']:
             token = tx['tokenSymbol']
-            value = int(tx['value']) / (10 ** int(tx['tokenDecimal']))
-            
-            if token not in stablecoins:
+            scale = _SCALE.get(token)
+
+            if scale is None:
                 continue
-                
-            usd_value = value
-            
+
+            usd_value = int(tx['value']) * scale
+
             if usd_value < min_usd:
                 continue
-            
+
             # Calculate confidence based on amount (higher = more confident)
             confidence = min(0.95, 0.7 + (usd_value / 100000000))
             
@@ -57,18 +104,20 @@ def fetch_whale_tx(min_usd=10000000):
                 vote_category='market_anomaly'
             )
             
-            # Also write to legacy ledger for backward compat
-            alert = {
+            # Also write to legacy ledger for backward compat (batched below)
+            alerts.append({
                 'agent_id': 'whale_001',
                 'agent_type': 'whale',
                 'message_type': 'mega_whale_alert',
                 'payload': event_data,
                 'status': 'pending_review'
-            }
-            supabase.table('ledger').insert(alert).execute()
-            
+            })
+
             print(f"MEGA WHALE: {wallet['entity_name']} moved ${usd_value:,.0f} {token} (confidence: {confidence:.2f})")
-            time.sleep(1)
+
+    # One bulk insert for every alert found in this scan
+    if alerts:
+        supabase.table('ledger').insert(alerts).execute()
 
 if __name__ == "__main__":
     if not check_kill_switch():
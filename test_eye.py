@@ -2,6 +2,8 @@ import os, requests
 from dotenv import load_dotenv
 load_dotenv('config/.env')
 key = os.getenv('ETHERSCAN_API_KEY')
-url = f"https://api.etherscan.io/v2/api?chainid=1&module=account&action=tokentx&address=0x28c6c06298d514db089934071355e5743bf21d60&page=1&offset=1&sort=desc&apikey={key}"
-r = requests.get(url).json()
-print(r['message'])
\ No newline at end of file
+# Connectivity check only: ethsupply is the cheapest endpoint and we
+# don't need to download or parse a transaction payload for this
+url = f"https://api.etherscan.io/v2/api?chainid=1&module=stats&action=ethsupply&apikey={key}"
+r = requests.get(url, timeout=5)
+print('OK' if r.ok else 'FAIL', r.status_code)